@@ -2,10 +2,11 @@
 from pypowertrain.system import *
 from pypowertrain.utils import *
 
+from collections import OrderedDict
+
 import scipy.optimize
 
 root = lambda root, x0: scipy.optimize.root_scalar(root, x0=x0).root
-root_b = lambda root, b: scipy.optimize.root_scalar(root, bracket=b, method='bisect').root
 
 def rot(a):
 	c, s =np.cos(a), np.sin(a)
@@ -204,11 +205,7 @@ class BikeSystem(System):
 	def traction_efficiency(self):
 		"""Returns an x-y curve, mapping from commanded traction to traction efficiency,
 		where the latter is the ratio of commanded traction in N for all wheels, to the realized total traction in N"""
-		q = self.downforce * 1.01
-		F = np.linspace(-q, q, 100, endpoint=True)	# force applied at each wheel
-		r = F * self.load.rear
-		f = F * self.load.front
-		return F, abs_traction(self, r, f) / (r+f)
+		return traction_table(self)
 
 	def nm_to_g(self, nm_per_motor):
 		# fixme need to add rotational inertia to load
@@ -244,6 +241,49 @@ class BikeSystem(System):
 		return self.load.kph_to_rpm(kph)
 
 
+# bounded LRU of traction efficiency tables, shared over all bikes with identical traction parameters
+_traction_tables = OrderedDict()
+traction_table_size = 256
+
+
+def traction_key(bike: BikeSystem):
+	"""All parameters that the traction efficiency of a bike depends on"""
+	load = bike.load
+	return (
+		bike.weight,
+		load.cog_height, load.cog_rear, load.cog_front,
+		load.Cf, load.grade,
+		load.front, load.rear,
+	)
+
+
+def traction_table(bike: BikeSystem):
+	"""Memoized traction efficiency curve of a bike
+
+	Variants of a bike created with `replace` share their table,
+	as long as they agree on weight, center of gravity, friction, grade and driven wheels
+	"""
+	key = traction_key(bike)
+	try:
+		_traction_tables.move_to_end(key)
+		return _traction_tables[key]
+	except KeyError:
+		pass
+
+	q = bike.downforce * 1.01
+	F = np.linspace(-q, q, 100, endpoint=True)	# force applied at each wheel
+	r = F * bike.load.rear
+	f = F * bike.load.front
+	table = F, abs_traction(bike, r, f) / (r+f)
+	for t in table:
+		t.flags.writeable = False	# shared between bikes; guard against in-place edits
+
+	_traction_tables[key] = table
+	while len(_traction_tables) > traction_table_size:
+		_traction_tables.popitem(last=False)
+	return table
+
+
 def bike_stats(bike):
 	print('total drag', bike.replace().system_drag(bike.nominal_kmh))
 	print('rolling drag', bike.replace(CdA=0).system_drag(bike.nominal_kmh))
@@ -252,21 +292,51 @@ def bike_stats(bike):
 
 def abs_traction(bike: BikeSystem, rearforce=None, frontforce=None):
 	"""calculate traction forces with abs,
-	taking into account motor limits, friction limits, and weight shift effects"""
+	taking into account motor limits, friction limits, and weight shift effects
+
+	The balance between commanded and realized total traction is piecewise linear in the total traction force,
+	with kinks where either wheel starts to slip or lifts off. Rather than root-finding element by element,
+	we evaluate the balance at all kinks at once, and solve the linear piece that brackets the root in closed form.
+	"""
 	if frontforce is None: frontforce = rearforce
 	if rearforce is None: rearforce = frontforce
 	rearforce, frontforce = np.broadcast_arrays(rearforce, frontforce)
+	# add trailing axis to hold the kinks of the piecewise linear balance function
+	rf, ff = rearforce[..., None], frontforce[..., None]
+	Cf = bike.load.Cf
 
 	def clip_mag(a, alim):
 		"""cap magnitude"""
 		alim = np.maximum(alim, 0)
 		return np.clip(a, -alim, +alim)
 
-	def virtual_abs(rf, ff):
-		"""solve for total traction over both wheels"""
-		rear_t_force = lambda t_force: clip_mag(rf, bike.shifted_rear_downforce(t_force) * bike.load.Cf)
-		front_t_force = lambda t_force: clip_mag(ff, bike.shifted_front_downforce(t_force) * bike.load.Cf)
-		balance = lambda t_force: rear_t_force(t_force) + front_t_force(t_force) - t_force
-		return root(balance, rf+ff)
-	force = [virtual_abs(r, f) for r, f in zip(rearforce, frontforce)]
+	def balance(t_force):
+		"""realized minus assumed total traction over both wheels"""
+		rear_t_force = clip_mag(rf, bike.shifted_rear_downforce(t_force) * Cf)
+		front_t_force = clip_mag(ff, bike.shifted_front_downforce(t_force) * Cf)
+		return rear_t_force + front_t_force - t_force
+
+	# realized traction never exceeds commanded traction in magnitude; so this always brackets the root
+	bound = np.abs(rf) + np.abs(ff)
+	s = bike.shift(1)	# weight shift per unit of traction force
+	with np.errstate(divide='ignore', invalid='ignore'):
+		kinks = [
+			(np.abs(rf) / Cf - bike.rear_downforce) / s,	# rear wheel starts slipping
+			-bike.rear_downforce / s,						# rear wheel lifts off
+			(bike.front_downforce - np.abs(ff) / Cf) / s,	# front wheel starts slipping
+			bike.front_downforce / s,						# front wheel lifts off
+		]
+	kinks = [np.broadcast_to(k, bound.shape) for k in kinks]
+	knots = np.concatenate([-bound] + kinks + [bound], axis=-1)
+	knots = np.sort(np.clip(np.nan_to_num(knots), -bound, bound), axis=-1)
+
+	# balance is non-negative at the lower bound and non-positive at the upper bound;
+	# find the first linear piece to cross zero, and interpolate the root within it.
+	# NOTE: for opposing wheel forces on high-grip surfaces, multiple equilibria may exist; we pick the lowest
+	b = balance(knots)
+	j = np.argmax(b[..., 1:] <= 0, axis=-1)[..., None]
+	t0, t1 = np.take_along_axis(knots, j, -1), np.take_along_axis(knots, j + 1, -1)
+	b0, b1 = np.take_along_axis(b, j, -1), np.take_along_axis(b, j + 1, -1)
+	w = np.where(b0 > b1, b0 / np.where(b0 > b1, b0 - b1, 1), 0)
+	force = (t0 + w * (t1 - t0))[..., 0]
 	return np.clip(force, bike.stoppie, bike.wheelie)
@@ -0,0 +1,219 @@
+"""Vehicle level performance figures of a bike
+
+Launch times, distances to speed, braking distances and sustained climbing speeds.
+All figures derive from a single solve of the torque envelope over a speed axis;
+integrals over speed are then evaluated for all target speeds and grades at once,
+rather than re-solving operating point grids per speed.
+"""
+import numpy as np
+
+from pypowertrain.system import *
+from pypowertrain.bike.bike import BikeSystem
+
+
+def speed_range(bike: BikeSystem, n=100, fw=1.5):
+	"""speed axis in kmh, from standstill up to a generous upper bound on top speed"""
+	max_rpm = bike.actuator.motor.electrical.Kv * bike.battery.voltage * fw * bike.actuator.n_series
+	return np.linspace(0, bike.x_axis_forward(max_rpm), n)
+
+
+def torque_envelope(bike: BikeSystem, kmh, n_torque=200, thermal=None):
+	"""peak driving and braking torque per motor as a function of speed
+
+	Parameters
+	----------
+	bike: BikeSystem
+	kmh: speed axis
+	n_torque: resolution of the torque axis
+	thermal: optional (dt, dT) tuple;
+		only admit operating points that heat the coils by less than dT over dt seconds
+
+	Returns
+	-------
+	Dict[str, ndarray]
+		peak driving and braking torque, and the bus power drawn at either, over the speed axis
+	"""
+	rpm = bike.x_axis_inverse(kmh)
+	max_torque = bike.actuator.peak_torque * 1.1
+	trange = np.linspace(-max_torque, +max_torque, n_torque + 1, endpoint=True)
+	graphs = system_limits(bike, trange, rpm)
+
+	torque = graphs['mechanical_torque']
+	valid = ~np.isnan(torque)
+	if thermal is not None:
+		dt, dT = thermal
+		temperature = bike.temperatures(rpm, graphs['copper_loss'], graphs['iron_loss'], dt=dt)
+		valid = np.logical_and(valid, temperature < dT)
+
+	j = np.arange(len(rpm))
+	peak = np.argmax(np.where(valid, torque, -np.inf), axis=0)
+	low = np.argmin(np.where(valid, torque, +np.inf), axis=0)
+	# speeds without any valid operating point get zero torque
+	sample = lambda graph, i: np.where(np.any(valid, axis=0), graph[i, j], 0)
+	return {
+		'kmh': np.asarray(kmh),
+		'torque': sample(torque, peak),
+		'braking': sample(torque, low),
+		'torque_bus_power': sample(graphs['bus_power'], peak),
+		'braking_bus_power': sample(graphs['bus_power'], low),
+	}
+
+
+def first_crossing(x, margin):
+	"""largest x up to which margin remains non-negative, linearly interpolated;
+	vectorized over any leading axes of margin"""
+	negative = margin < 0
+	j = np.argmax(negative, axis=-1)
+	p = np.maximum(j - 1, 0)
+	m0 = np.take_along_axis(margin, p[..., None], -1)[..., 0]
+	m1 = np.take_along_axis(margin, j[..., None], -1)[..., 0]
+	w = np.where(m0 > m1, m0 / np.where(m0 > m1, m0 - m1, 1), 0)
+	crossing = x[p] + w * (x[j] - x[p])
+	return np.where(np.any(negative, axis=-1), crossing, x[-1])
+
+
+def leading(mask):
+	"""number of leading True entries in a boolean array"""
+	return np.argmin(np.append(mask, False))
+
+
+def launch(bike: BikeSystem, envelope, min_accel=1e-3):
+	"""time, distance and bus energy to accelerate from standstill to each speed of the envelope, at full throttle
+
+	Speeds beyond the first speed at which acceleration drops below `min_accel` G,
+	which approximates top speed, are unreachable and are truncated from the output
+	"""
+	kmh = envelope['kmh']
+	accel = bike.acceleration(kmh, envelope['torque']) * 9.81
+	power = envelope['torque_bus_power'] * bike.load.n_motors
+	x, e, t = integrate_traject_cumulative(kmh / 3.6, accel, power)
+	n = leading(accel[:-1] > min_accel * 9.81) + 1
+	return {'kmh': kmh[:n], 'time': t[:n], 'distance': x[:n], 'energy': e[:n]}
+
+
+def braking(bike: BikeSystem, envelope, min_accel=1e-3):
+	"""time, distance and bus energy to brake from each speed of the envelope to standstill, at full braking
+
+	Bus energy is negative where braking is regenerative
+	"""
+	kmh = envelope['kmh']
+	accel = bike.acceleration(kmh, envelope['braking']) * 9.81
+	power = envelope['braking_bus_power'] * bike.load.n_motors
+	# braking from speed i traverses the first i+1 samples in reverse
+	x, e, t = integrate_traject_cumulative(kmh / 3.6, accel, power, reverse=True)
+	n = leading(-accel[1:] > min_accel * 9.81) + 1
+	return {'kmh': kmh[:n], 'time': t[:n], 'distance': x[:n], 'energy': e[:n]}
+
+
+def time_to_speed(launch, kmh):
+	"""time in s to reach the given speed(s) in kmh; nan if unreachable"""
+	return np.interp(kmh, launch['kmh'], launch['time'], right=np.nan)
+
+
+def distance_to_speed(launch, kmh):
+	"""distance in m to reach the given speed(s) in kmh; nan if unreachable"""
+	return np.interp(kmh, launch['kmh'], launch['distance'], right=np.nan)
+
+
+def time_to_distance(launch, distance):
+	"""time in s and speed in kmh, at which the given distance(s) in m are covered, from standstill
+
+	Beyond the last reachable speed, we assume we cruise on at that speed
+	"""
+	x, t, kmh = launch['distance'], launch['time'], launch['kmh']
+	distance = np.asarray(distance, dtype=float)
+	cruise = distance > x[-1]
+	time = np.where(cruise, t[-1] + (distance - x[-1]) / np.maximum(kmh[-1] / 3.6, 1e-9), np.interp(distance, x, t))
+	speed = np.where(cruise, kmh[-1], np.interp(distance, x, kmh))
+	return time[()], speed[()]
+
+
+def braking_distance(braking, kmh):
+	"""distance in m to come to a standstill from the given speed(s) in kmh; nan if out of range"""
+	return np.interp(kmh, braking['kmh'], braking['distance'], right=np.nan)
+
+
+def hill_climb(bike: BikeSystem, grades, dt=600, dT=60, kmh=None, n_torque=200):
+	"""sustained climbing speed in kmh, as a function of grade in percent
+
+	Parameters
+	----------
+	bike: BikeSystem
+	grades: grades to evaluate, in percent
+	dt: duration of the climb in seconds
+	dT: admissible coil temperature rise over the duration of the climb
+	kmh: speed axis; defaults to `speed_range`
+
+	Returns
+	-------
+	Dict[str, ndarray]
+		sustained speed at the start and at the end of the climb,
+		where the latter accounts for battery sag from the energy spent climbing,
+		as well as the battery charge state at the end of the climb, per grade
+
+	Notes
+	-----
+	Battery sag is accounted for by solving the thermally limited envelope once at the start charge state,
+	and once at the lowest end-of-climb charge state over all grades, interpolating linearly in between.
+	Charge state is taken to be linear in energy spent, which is a first order approximation
+	"""
+	kmh = speed_range(bike) if kmh is None else np.asarray(kmh)
+	grades = np.asarray(grades, dtype=float)
+
+	# per motor torque required to hold each speed on each grade;
+	# the gravity term of the bike's own grade is swapped out for each grade in turn
+	flat_drag = bike.drag(kmh) + bike.gravity_drag()
+	slope_drag = bike.downforce * np.sin(np.arctan(grades / 100))
+	required = (flat_drag + slope_drag[..., None]) * bike.load.wheel_radius / bike.load.n_motors
+
+	envelope = torque_envelope(bike, kmh, n_torque=n_torque, thermal=(dt, dT))
+	speed = first_crossing(kmh, envelope['torque'] - required)
+
+	# battery charge spent over the climb
+	power = np.interp(speed, kmh, envelope['torque_bus_power']) * bike.load.n_motors
+	charge = bike.battery.charge_state
+	end_charge = np.clip(charge - np.maximum(power, 0) * dt / 3600 / bike.battery.capacity, 0, 1)
+
+	sag = charge - end_charge.min()
+	if sag > 0:
+		sagged = torque_envelope(
+			bike.replace(battery__charge_state=end_charge.min()), kmh, n_torque=n_torque, thermal=(dt, dT))
+		w = ((charge - end_charge) / sag)[..., None]
+		torque = envelope['torque'] * (1 - w) + sagged['torque'] * w
+		end_speed = first_crossing(kmh, torque - required)
+	else:
+		end_speed = speed
+
+	return {'grade': grades, 'speed': speed, 'end_speed': end_speed, 'end_charge': end_charge}
+
+
+def bike_performance(
+	bike: BikeSystem,
+	speeds=(25, 45),
+	distances=(402.336,),
+	grades=(0, 5, 10, 20),
+	n_kmh=100,
+):
+	"""flat summary of launch, braking and climbing performance of a bike
+
+	Returns
+	-------
+	Dict[str, float]
+	"""
+	kmh = speed_range(bike, n=n_kmh)
+	envelope = torque_envelope(bike, kmh)
+	up, down = launch(bike, envelope), braking(bike, envelope)
+	climb = hill_climb(bike, grades, kmh=kmh)
+
+	summary = {'top_speed': float(up['kmh'][-1])}
+	for s in speeds:
+		summary[f'time_to_{s}kmh'] = float(time_to_speed(up, s))
+		summary[f'distance_to_{s}kmh'] = float(distance_to_speed(up, s))
+		summary[f'braking_from_{s}kmh'] = float(braking_distance(down, s))
+	for d in distances:
+		time, speed = time_to_distance(up, d)
+		summary[f'time_to_{d}m'] = float(time)
+		summary[f'speed_at_{d}m'] = float(speed)
+	for g, s in zip(climb['grade'], climb['end_speed']):
+		summary[f'climb_{g:g}%'] = float(s)
+	return summary
@@ -56,6 +56,34 @@ def test_motorcycle():
 	# system_dash(bike).run()
 
 
+def test_abs_traction():
+	"""closed-form traction solve should agree with a per-element root finder"""
+	import scipy.optimize
+	bike = define_moped(front=True, rear=True)
+	q = bike.downforce * 1.5
+	force, split = [f.flatten() for f in np.meshgrid(np.linspace(-q, q, 21), np.linspace(0, 1, 11))]
+	rear, front = force * split, force * (1 - split)
+
+	for cf in [0.2, 0.6, 1.2]:
+		b = bike.replace(__Cf=cf)
+		def reference(r, f):
+			clip_mag = lambda a, alim: np.clip(a, -max(alim, 0), max(alim, 0))
+			balance = lambda t: \
+				clip_mag(r, b.shifted_rear_downforce(t) * cf) + clip_mag(f, b.shifted_front_downforce(t) * cf) - t
+			bound = abs(r) + abs(f)
+			return scipy.optimize.brentq(balance, -bound, bound, xtol=1e-9) if bound else 0.
+		expected = np.clip([reference(r, f) for r, f in zip(rear, front)], b.stoppie, b.wheelie)
+		assert np.allclose(abs_traction(b, rear, front), expected, atol=1e-6)
+
+
+def test_traction_table():
+	"""traction tables are shared between bike variants that only differ in non-traction parameters"""
+	bike = define_moped(front=True, rear=True)
+	x, y = bike.traction_efficiency
+	assert bike.replace(CdA=0.3, wheel_diameter=0.6).traction_efficiency[1] is y
+	assert bike.replace(__Cf=0.9).traction_efficiency[1] is not y
+
+
 def test_abs_braking():
 	"""make some plots to gain insight into traction behavior;
 	interplay with both wheels, weight shift and friction"""
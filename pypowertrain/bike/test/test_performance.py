@@ -0,0 +1,46 @@
+import numpy as np
+
+from pypowertrain.bike.bike_models import *
+from pypowertrain.bike.performance import *
+
+
+def test_moped():
+	"""launch, braking and climbing figures of a dual drive moped"""
+	bike = define_moped(front=True, rear=True)
+	kmh = speed_range(bike)
+	envelope = torque_envelope(bike, kmh)
+
+	up = launch(bike, envelope)
+	assert np.all(np.diff(up['time']) > 0)
+	assert np.all(np.diff(up['distance']) > 0)
+	print()
+	print('top speed', up['kmh'][-1])
+	print('0-45kmh', time_to_speed(up, 45), distance_to_speed(up, 45))
+	print('quarter mile', time_to_distance(up, 402.336))
+
+	down = braking(bike, envelope)
+	assert np.all(np.diff(down['distance']) > 0)
+	print('braking from 45kmh', braking_distance(down, 45))
+
+	climb = hill_climb(bike, [0, 5, 10, 20], kmh=kmh)
+	assert np.all(np.diff(climb['speed']) < 0)
+	assert np.all(climb['end_speed'] <= climb['speed'] + 1e-9)
+	print(climb)
+
+	print(bike_performance(bike))
+
+
+def test_launch():
+	"""launch integrals should agree with explicit time stepping at constant acceleration limits"""
+	bike = define_moped()
+	kmh = np.linspace(0, 40, 200)
+	up = launch(bike, torque_envelope(bike, kmh))
+
+	# explicit euler integration of the same acceleration curve
+	accel = lambda v: np.interp(v * 3.6, kmh, bike.acceleration(kmh, torque_envelope(bike, kmh)['torque'])) * 9.81
+	v, x, t, dt = 0, 0, 0, 1e-3
+	while v < 30 / 3.6:
+		a = accel(v)
+		x, v, t = x + v * dt, v + a * dt, t + dt
+	assert np.isclose(time_to_speed(up, 30), t, rtol=2e-2)
+	assert np.isclose(distance_to_speed(up, 30), x, rtol=2e-2)
@@ -539,6 +539,36 @@ def graph_sampler(graph, sample=0, s=0, e=None):
 	return inner
 
 
+def integrate_traject_cumulative(v, a, d=0, reverse=False):
+	"""calculate braking/accel distance and dissipation, over all prefixes of the sample points at once
+
+	velocity, acceleration and dissipation sample points,
+	where the last axis is the trajectory axis, and any leading axes are batch axes
+
+	could be either in radial or linear units
+
+	Returns
+	-------
+	x, e, t: ndarray
+		distance, energy and time, where entry i along the last axis
+		integrates over the trajectory through the first i+1 sample points
+	"""
+	v, a, d = np.broadcast_arrays(v, a, d)
+	dv = np.diff(v, axis=-1)
+	if reverse:
+		# each prefix is traversed backwards; so every interval is entered at its upper sample point
+		dv = -dv
+		v, a, d = v[..., 1:], a[..., 1:], d[..., 1:]
+	else:
+		v, a, d = v[..., :-1], a[..., :-1], d[..., :-1]
+	dt = dv / a
+
+	def cumulative(q):
+		zero = np.zeros(q.shape[:-1] + (1,))
+		return np.concatenate([zero, np.cumsum(q, axis=-1)], axis=-1)
+	return cumulative(v * dt), cumulative(d * dt), cumulative(dt)
+
+
 def integrate_traject(v, a, d=0, reverse=False):
 	"""calculate braking/accel distance and dissipation
 
@@ -546,37 +576,43 @@ def integrate_traject(v, a, d=0, reverse=False):
 
 	could be either in radial or linear units
 	"""
-	v, a, d = np.broadcast_arrays(v, a, d)
-	if reverse:
-		v = v[::-1]
-		a = a[::-1]
-		d = d[::-1]
-	dv = np.diff(v)
-	x = 0
-	e = 0
-	t = 0
-	for i in range(len(dv)):
-		dt = dv[i] / a[i]
-		t += dt
-		x += v[i] * dt
-		e += d[i] * dt
-	return x, e, t
+	x, e, t = integrate_traject_cumulative(v, a, d, reverse=reverse)
+	return x[..., -1][()], e[..., -1][()], t[..., -1][()]
 
 
-def integrate_step(rpm, accel, size):
-	"""calculate time taken to perform a step function
-	of `size` units, from standstill to standstill,
+def integrate_steps(rpm, accel, sizes):
+	"""calculate time taken to perform step functions
+	of each of `sizes` units, from standstill to standstill,
 	given an acceleration graph
+
+	Returns
+	-------
+	time, rpm: ndarray
+		time taken and peak rpm reached for each step size; nan where the step is out of range of the graph
 	"""
 	f = graph_sampler(accel, 300)(accel)
 	r = graph_sampler(accel, -300)(accel)
 	radps = rpm/60*2*np.pi
 
-	def step(i):
-		x1, _, t1 = integrate_traject(radps[:i], f[:i])
-		x2, _, t2 = integrate_traject(radps[:i], r[:i], reverse=True)
-		return x1+x2, t1+t2
-	for i in range(len(rpm)):
-		angle, time = step(i)
-		if angle > size:
-			return time, rpm[i]
+	# accelerate up to a given rpm, and then brake back down from it
+	x1, _, t1 = integrate_traject_cumulative(radps, f)
+	x2, _, t2 = integrate_traject_cumulative(radps, r, reverse=True)
+	# peaking at sample i, we integrate over the samples strictly before it
+	angle = np.concatenate([[0], (x1 + x2)[:-1]])
+	time = np.concatenate([[0], (t1 + t2)[:-1]])
+
+	# find the first peak rpm that covers each step
+	covered = angle > np.asarray(sizes)[..., None]
+	i = np.argmax(covered, axis=-1)
+	valid = np.any(covered, axis=-1)
+	return np.where(valid, time[i], np.nan)[()], np.where(valid, rpm[i], np.nan)[()]
+
+
+def integrate_step(rpm, accel, size):
+	"""calculate time taken to perform a step function
+	of `size` units, from standstill to standstill,
+	given an acceleration graph
+	"""
+	time, peak_rpm = integrate_steps(rpm, accel, size)
+	if not np.isnan(time):
+		return time, peak_rpm
@@ -32,3 +32,27 @@ def test_plot():
 	print(system.actuator.motor.electrical.Lq)
 	# return
 	system_plot(system)
+
+
+def test_integrate_traject():
+	"""cumulative integration should agree with integrating each prefix separately"""
+	v = np.linspace(0, 10, 20)
+	a = np.linspace(3, 1, 20)
+	d = np.linspace(0, 1, 20)
+	for reverse in [False, True]:
+		cumulative = integrate_traject_cumulative(v, a, d, reverse=reverse)
+		for i in range(1, len(v)):
+			assert np.allclose([c[i] for c in cumulative], integrate_traject(v[:i+1], a[:i+1], d[:i+1], reverse=reverse))
+
+
+def test_integrate_steps():
+	rpm = np.linspace(0, 3000, 120)
+	accel = np.linspace(-600, 600, 201)[:, None] * np.linspace(1, 0.2, 120)
+	sizes = [1, 10, 100, 1e5]
+	times, rpms = integrate_steps(rpm, accel, sizes)
+	for size, time, peak in zip(sizes, times, rpms):
+		step = integrate_step(rpm, accel, size)
+		if step is None:
+			assert np.isnan(time)
+		else:
+			assert np.allclose(step, (time, peak))